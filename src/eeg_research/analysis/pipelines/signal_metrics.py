@@ -130,8 +130,6 @@ class SignalMetrics:
             "average_rms",
             "max_gradient",
             "zero_crossing_rate",
-            "hjorth_mobility",
-            "hjorth_complexity",
             "kurtosis",
             "skewness",
             "variance",
@@ -145,4 +143,8 @@ class SignalMetrics:
                 metric_name,
                 getattr(time_analysis, metric_name)(data_epoched, axis=0),
             )
+        # Both Hjorth parameters come from the same derivative of the signal
+        self.hjorth_mobility, self.hjorth_complexity = time_analysis.hjorth_parameters(
+            data_epoched, axis=0
+        )
         return self
@@ -98,7 +98,10 @@ class Spectrum:
         self.signal = raw.get_data()
         self._adjust_signal_length()
         self.signal_length = np.shape(self.signal)[1]
-        self.spectrum = scipy.fft.rfft(self.signal) * 2 / self.signal_length
+        # All channels are transformed in one call, spread over all the cores
+        self.spectrum = (
+            scipy.fft.rfft(self.signal, axis=1, workers=-1) * 2 / self.signal_length
+        )
         self.frequencies = scipy.fft.fftfreq(
             self.spectrum.shape[1], 1 / self.sampling_rate
         )
@@ -134,7 +137,7 @@ class Spectrum:
         return self
 
     def _set_frequency_of_interest(
-        self, frequency_of_interest: float = 12
+        self, frequency_of_interest: np.ndarray | float = 12
     ) -> "Spectrum":
         """Set the frequency of interest.
 
@@ -142,7 +145,8 @@ class Spectrum:
         in order to get the amplitude of the surrounding bins.
 
         Args:
-            frequency_of_interest (float): The frequency of interest.
+            frequency_of_interest (np.ndarray | float): The frequency of
+                interest, or one frequency of interest per channel.
 
         Returns:
             typing.Self: The Spectrum object
@@ -280,7 +284,18 @@ class Spectrum:
         Returns:
             self : The modified Spectrum object.
         """
-        baseline = self._get_baseline()
+        return self._subtract_baseline(self._get_baseline())
+
+    def _subtract_baseline(self, baseline: np.ndarray | float) -> "Spectrum":
+        """Subtract a baseline from the spectrum of each channel.
+
+        Args:
+            baseline (np.ndarray | float): The baseline of each channel,
+                                           with shape (channels, 1).
+
+        Returns:
+            self : The modified Spectrum object.
+        """
         self.info["process_history"].append("Baseline corrected")
         self.spectrum = np.subtract(self.spectrum, baseline)
         return self
@@ -356,11 +371,16 @@ class Spectrum:
         if not self._frequency_of_interest_exists():
             raise ValueError("The frequency of interest has to be set first.")
 
-        if not self._baseline_corrected():
-            self.correct_baseline()
-
+        # The surrounding bins are extracted once and used for both the
+        # baseline and the standard deviation. The standard deviation does not
+        # depend on the baseline correction so it can be taken before it.
         amplitude_surrounding_bins = self._get_amplitude_surounding_bins()
 
+        if not self._baseline_corrected():
+            self._subtract_baseline(
+                np.mean(amplitude_surrounding_bins, axis=1).reshape(-1, 1)
+            )
+
         surrounding_bin_std = np.std(amplitude_surrounding_bins, axis=1).reshape(-1, 1)
 
         self.spectrum = np.divide(self.spectrum, surrounding_bin_std)
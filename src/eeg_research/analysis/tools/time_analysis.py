@@ -44,7 +44,10 @@ def average_rms(signal: np.ndarray, axis: int = 1) -> float:
     Returns:
         float: the average root mean square of the signal
     """
-    return np.sqrt(np.mean(signal**2, axis=axis))
+    # einsum sums the squares in a single pass without allocating signal**2
+    signal = np.moveaxis(signal, axis, -1)
+    sum_of_squares = np.einsum("...i,...i->...", signal, signal)
+    return np.sqrt(sum_of_squares / signal.shape[-1])
 
 
 def max_gradient(signal: np.ndarray, axis: int = 1) -> float:
@@ -63,7 +66,9 @@ def max_gradient(signal: np.ndarray, axis: int = 1) -> float:
     Returns:
         float: the maximum gradient of the signal
     """
-    return np.max(np.abs(np.diff(signal, axis=axis)), axis=axis)
+    # max(|d|) == max(max(d), -min(d)): avoids allocating np.abs(d)
+    gradient = np.diff(signal, axis=axis)
+    return np.maximum(np.max(gradient, axis=axis), -np.min(gradient, axis=axis))
 
 
 def zero_crossing_rate(signal: np.ndarray, axis: int = 1) -> float:
@@ -81,7 +86,10 @@ def zero_crossing_rate(signal: np.ndarray, axis: int = 1) -> float:
     Returns:
         float: the zero crossing rate of the signal
     """
-    return np.mean(np.diff(np.sign(signal) != 0, axis=axis), axis=axis)
+    # The sign bit flips between two consecutive samples exactly when the
+    # signal crosses 0; np.diff on booleans is a branchless XOR.
+    sign_bits = np.signbit(signal)
+    return np.mean(np.diff(sign_bits, axis=axis), axis=axis)
 
 
 def hjorth_mobility(signal: np.ndarray, axis: int = 1) -> float:
@@ -119,9 +127,32 @@ def hjorth_complexity(signal: np.ndarray, axis: int = 1) -> float:
     Returns:
         float: the complexity score of the signal
     """
-    derived_signal_mobility = hjorth_mobility(np.diff(signal, axis=axis), axis=axis)
-    signal_mobility = hjorth_mobility(signal, axis=axis)
-    return derived_signal_mobility / signal_mobility
+    _, complexity = hjorth_parameters(signal, axis=axis)
+    return complexity
+
+
+def hjorth_parameters(signal: np.ndarray, axis: int = 1) -> tuple[float, float]:
+    """Calculate both the mobility and the complexity of the signal.
+
+    The first derivative and its variance are shared by the two parameters,
+    so they are computed only once instead of once per parameter.
+
+    Args:
+        signal (np.ndarray): the signal to be analyzed
+        axis (int): the axis along which the parameters are calculated
+
+    Returns:
+        tuple[float, float]: the mobility and the complexity of the signal
+    """
+    first_derivative = np.diff(signal, axis=axis)
+    first_derivative_variance = np.var(first_derivative, axis=axis)
+    second_derivative_variance = np.var(np.diff(first_derivative, axis=axis), axis=axis)
+    signal_variance = np.var(signal, axis=axis)
+    derived_signal_mobility = np.sqrt(
+        second_derivative_variance / first_derivative_variance
+    )
+    signal_mobility = np.sqrt(first_derivative_variance / signal_variance)
+    return signal_mobility, derived_signal_mobility / signal_mobility
 
 
 def signal_range(signal: np.ndarray, axis: int = 1) -> float:
@@ -27,6 +27,9 @@
 
 """CLI for processing and cleaning EEG data in BIDS format."""
 
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
 from eeg_research.cli.tools.bids_parser import BIDSParser
 from eeg_research.cli.tools.interactive_menu import InteractiveMenu
 from eeg_research.preprocessing.pipelines.bcg_cleaning_pipeline import clean_bcg
@@ -36,6 +39,29 @@ from eeg_research.preprocessing.pipelines.gradient_cleaning_pipeline import (
 from eeg_research.preprocessing.tools.utils import read_raw_eeg, save_clean_eeg
 
 
+def clean_file(file: str, scripts: list[str]) -> None:
+    """Run the selected cleaning scripts on one file and save the result.
+
+    Args:
+        file (str): path to the EEG file to clean.
+        scripts (list[str]): keys of the scripts to run ("gradient", "bcg",
+            "qc").
+    """
+    print(f"Current file: {file}")
+
+    raw = read_raw_eeg(file, preload=True)
+
+    if "gradient" in scripts:
+        raw = clean_gradient(raw)
+    if "bcg" in scripts:
+        raw = clean_bcg(raw)
+    if "qc" in scripts:
+        # implement quality control
+        pass
+
+    save_clean_eeg(raw, file, scripts)
+
+
 def main() -> None:
     """Main function."""
     parser = BIDSParser()
@@ -119,22 +145,17 @@ def main() -> None:
 
         print(f"Running {selected_scripts} scripts on these files:")
 
-    for file in files:
-        print(f"Current file: {file}")
-
-        raw = read_raw_eeg(file, preload=True)
-
-        selected_scripts_keys = [k for k, v in scripts.items() if v in selected_scripts]
+    selected_scripts_keys = [k for k, v in scripts.items() if v in selected_scripts]
 
-        if "gradient" in selected_scripts_keys:
-            raw = clean_gradient(raw)
-        if "bcg" in selected_scripts_keys:
-            raw = clean_bcg(raw)
-        if "qc" in selected_scripts_keys:
-            # implement quality control
-            pass
-
-        save_clean_eeg(raw, file, selected_scripts_keys)
+    # Files are independent from each other, they can be cleaned in parallel
+    if parser.args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=parser.args.jobs) as executor:
+            scripts_per_file = itertools.repeat(selected_scripts_keys)
+            # Consume the results so that errors raised in workers propagate
+            list(executor.map(clean_file, files, scripts_per_file))
+    else:
+        for file in files:
+            clean_file(file, selected_scripts_keys)
 
     print("Processing complete.")
 
@@ -1,10 +1,175 @@
 """This module contains the BIDSParser class."""
 
 import argparse
+import functools
 import re
 from pathlib import Path
 
 import bids
+import numpy as np
+
+
+def _positive_int(value: str) -> int:
+    """Convert a command line value to a strictly positive integer.
+
+    Args:
+        value: The value given on the command line.
+
+    Returns:
+        The value as an integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not an integer greater
+            than 0.
+    """
+    if not value.isdecimal() or int(value) < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be an integer greater than 0 (received {value!r})."
+        )
+    return int(value)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the command line parser.
+
+    The parser is built once and cached so that repeated BIDSParser
+    instantiations do not rebuild the same argument tables.
+
+    Returns:
+        The argument parser of the CLI.
+    """
+    # Create the parser with RawTextHelpFormatter so that newlines are preserved
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+
+    parser.add_argument(
+        "--root",
+        help="Root folder.",
+        default=None,
+        required=True,
+    )
+
+    parser.add_argument(
+        "--datafolder",
+        help="Data folder to search for files. "
+        "Options are 'source', 'rawdata' or 'derivatives'.",
+        choices=["source", "rawdata", "derivatives"],
+        default=None,
+    )
+
+    parser.add_argument(
+        "--subject",
+        help="Input options for subject IDs are: \n"
+        "- '*' for all subjects \n"
+        "- 'x' for subject x \n"
+        "- 'x-y' for subjects x to y \n"
+        "- 'x-*' for subjects x to the last \n"
+        "- '*-y' for subjects from the first to y",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--session",
+        help="Input options for session IDs are: \n"
+        "- '*' for all sessions \n"
+        "- 'x' for session x \n"
+        "- 'x-y' for sessions x to y \n"
+        "- 'x-*' for sessions x to the last \n"
+        "- '*-y' for sessions from the first to y",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--run",
+        help="Input options for run IDs are: \n"
+        "- '*' for all runs \n"
+        "- 'x' for run x \n"
+        "- 'x-y' for runs x to y \n"
+        "- 'x-*' for runs x to the last \n"
+        "- '*-y' for runs from the first to y",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--task",
+        help="Input options for task IDs are: \n"
+        "- '*' for all tasks \n"
+        "- 'a' for task a",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--extension",
+        help="Input options for file extensions are: \n"
+        "- '*' for all extensions \n"
+        "- 'a' for extension a",
+        default=None,
+    )
+
+    parser.add_argument(
+        "--datatype",
+        help="Input options for datatypes are: \n"
+        "- '*' for all datatypes \n"
+        "- 'a' for datatype a",
+        default="eeg",
+    )
+
+    parser.add_argument(
+        "--suffix",
+        help="Input options for suffixes are: \n"
+        "- '*' for all suffixes \n"
+        "- 'a' for suffix a",
+        default="eeg",
+    )
+
+    parser.add_argument(
+        "--description",
+        help="Description is only applicable to derivative data.",
+        default=None,
+    )
+    parser.add_argument(
+        "--layout-db",
+        help="Folder of the pybids layout database. It is created on the first\n"
+        "run and reused on the next ones to skip the indexing of the dataset.",
+        default=None,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="Number of files to clean in parallel.",
+        type=_positive_int,
+        default=1,
+    )
+    parser.add_argument(
+        "--interactive",
+        help="Run the interactive menu",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--gradient",
+        help="Clean the gradient artifacts",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--bcg",
+        help="Clean the BCG artifacts",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--qc",
+        help="Run the quality control script",
+        action="store_true",
+        default=False,
+    )
+
+    return parser
 
 
 class BIDSParser:
@@ -19,129 +184,13 @@ class BIDSParser:
         self.args = self._parse_arguments()
         self.reading_root = self._set_reading_root()
         self.indexer = bids.BIDSLayoutIndexer()
-        self.layout = self._set_layout(self.indexer)
+        self.layout = self._set_layout(self.indexer, self.args.layout_db)
+        self._entity_ids: dict[str, list] = dict()
         self.entities = self._set_entities()
 
     def _parse_arguments(self) -> argparse.Namespace:
         """Parse command line arguments."""
-        # Create the parser with RawTextHelpFormatter so that newlines are preserved
-        parser = argparse.ArgumentParser(
-            description=__doc__, formatter_class=argparse.RawTextHelpFormatter
-        )
-
-        parser.add_argument(
-            "--root",
-            help="Root folder.",
-            default=None,
-            required=True,
-        )
-
-        parser.add_argument(
-            "--datafolder",
-            help="Data folder to search for files. "
-            "Options are 'source', 'rawdata' or 'derivatives'.",
-            choices=["source", "rawdata", "derivatives"],
-            default=None,
-        )
-
-        parser.add_argument(
-            "--subject",
-            help="Input options for subject IDs are: \n"
-            "- '*' for all subjects \n"
-            "- 'x' for subject x \n"
-            "- 'x-y' for subjects x to y \n"
-            "- 'x-*' for subjects x to the last \n"
-            "- '*-y' for subjects from the first to y",
-            default=None,
-        )
-
-        parser.add_argument(
-            "--session",
-            help="Input options for session IDs are: \n"
-            "- '*' for all sessions \n"
-            "- 'x' for session x \n"
-            "- 'x-y' for sessions x to y \n"
-            "- 'x-*' for sessions x to the last \n"
-            "- '*-y' for sessions from the first to y",
-            default=None,
-        )
-
-        parser.add_argument(
-            "--run",
-            help="Input options for run IDs are: \n"
-            "- '*' for all runs \n"
-            "- 'x' for run x \n"
-            "- 'x-y' for runs x to y \n"
-            "- 'x-*' for runs x to the last \n"
-            "- '*-y' for runs from the first to y",
-            default=None,
-        )
-
-        parser.add_argument(
-            "--task",
-            help="Input options for task IDs are: \n"
-            "- '*' for all tasks \n"
-            "- 'a' for task a",
-            default=None,
-        )
-
-        parser.add_argument(
-            "--extension",
-            help="Input options for file extensions are: \n"
-            "- '*' for all extensions \n"
-            "- 'a' for extension a",
-            default=None,
-        )
-
-        parser.add_argument(
-            "--datatype",
-            help="Input options for datatypes are: \n"
-            "- '*' for all datatypes \n"
-            "- 'a' for datatype a",
-            default="eeg",
-        )
-
-        parser.add_argument(
-            "--suffix",
-            help="Input options for suffixes are: \n"
-            "- '*' for all suffixes \n"
-            "- 'a' for suffix a",
-            default="eeg",
-        )
-
-        parser.add_argument(
-            "--description",
-            help="Description is only applicable to derivative data.",
-            default=None,
-        )
-        parser.add_argument(
-            "--interactive",
-            help="Run the interactive menu",
-            action="store_true",
-            default=False,
-        )
-
-        parser.add_argument(
-            "--gradient",
-            help="Clean the gradient artifacts",
-            action="store_true",
-            default=False,
-        )
-
-        parser.add_argument(
-            "--bcg",
-            help="Clean the BCG artifacts",
-            action="store_true",
-            default=False,
-        )
-
-        parser.add_argument(
-            "--qc",
-            help="Run the quality control script",
-            action="store_true",
-            default=False,
-        )
-
+        parser = _get_parser()
         args = parser.parse_args()
 
         if not any([args.interactive, args.gradient, args.bcg, args.qc]):
@@ -159,18 +208,49 @@ class BIDSParser:
         else:
             return Path(self.args.root) / self.args.datafolder
 
-    def _set_layout(self, indexer: bids.BIDSLayoutIndexer) -> bids.BIDSLayout:
-        """Set the BIDS layout with the given indexer based on args.datafolder."""
+    def _set_layout(
+        self, indexer: bids.BIDSLayoutIndexer, database_path: str | None = None
+    ) -> bids.BIDSLayout:
+        """Set the BIDS layout with the given indexer based on args.datafolder.
+
+        Args:
+            indexer: The indexer used to build the layout.
+            database_path: The folder of the layout database. If it already
+                exists, the layout is loaded from it instead of indexing the
+                dataset, otherwise the index is saved there.
+
+        Returns:
+            The BIDS layout.
+        """
         if self.args.datafolder is None or "derivatives" not in self.args.datafolder:
-            return bids.BIDSLayout(root=self.reading_root, indexer=indexer)
+            return bids.BIDSLayout(
+                root=self.reading_root, database_path=database_path, indexer=indexer
+            )
         else:
             return bids.BIDSLayout(
                 root=self.reading_root,
                 validate=False,
                 is_derivative=True,
+                database_path=database_path,
                 indexer=indexer,
             )
 
+    def _get_entity_ids(self, entity: str) -> list:
+        """Get the IDs of an entity in the layout.
+
+        The query is only sent once to the layout for each entity, the
+        following calls are served from a cache.
+
+        Args:
+            entity: The entity to get from the layout.
+
+        Returns:
+            The list of IDs available for the entity.
+        """
+        if entity not in self._entity_ids:
+            self._entity_ids[entity] = self.layout.get(target=entity, return_type="id")
+        return self._entity_ids[entity]
+
     def _parse_range_args(
         self, entity: str, value: str | None
     ) -> list[int] | str | None:
@@ -188,15 +268,14 @@ class BIDSParser:
             IndexError: If the start or end index is out of range.
         """
         if value == "*":
-            return self.layout.get(target=entity, return_type="id")
+            return self._get_entity_ids(entity)
         elif value is not None and "-" in value:
             start, end = map(lambda x: None if x == "*" else int(x), value.split("-"))
 
-            ids_str = self.layout.get(target=entity, return_type="id")
+            ids_str = self._get_entity_ids(entity)
 
-            try:
-                ids_int = [int(id) for id in ids_str]
-            except ValueError:
+            # Run IDs come back from pybids as integers, hence the str() cast
+            if not all(str(id).isdigit() for id in ids_str):
                 raise ValueError(
                     f"Range not valid for '{entity}' as it contains non-integers. "
                     "Please use the interactive menu to select IDs."
@@ -217,11 +296,14 @@ class BIDSParser:
                     f"start value {start}. Please provide a valid range."
                 )
 
-            ids_in_range = [
-                ids_str[i]
-                for i, id in enumerate(ids_int)
-                if (start is None or id >= start) and (end is None or id <= end)
-            ]
+            ids_int = np.fromiter(map(int, ids_str), dtype=np.int64, count=len(ids_str))
+            in_range = np.ones(len(ids_int), dtype=bool)
+            if start is not None:
+                in_range &= ids_int >= start
+            if end is not None:
+                in_range &= ids_int <= end
+
+            ids_in_range = [ids_str[i] for i in np.flatnonzero(in_range)]
 
             if not ids_in_range:
                 raise ValueError(
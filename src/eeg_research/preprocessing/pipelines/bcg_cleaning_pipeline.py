@@ -41,7 +41,11 @@ def clean_bcg(raw: mne.io.Raw) -> mne.io.Raw:
     Returns:
         raw (mne.io.Raw): MNE raw object
     """
-    raw.filter(1, 50).resample(250)
+    # Downsample before filtering so the filter runs on fewer samples. The
+    # resampling already removes the content above the new Nyquist frequency.
+    if raw.info["sfreq"] > 250:
+        raw.resample(250)
+    raw.filter(1, 50)
 
     # ===============================================================================
     # ECG AND EOG CHANNELS DETECTION
@@ -25,14 +25,28 @@
 # ===============================================================================
 """Module to preprocess the CST dataset."""
 
-import datetime
+import functools
 import os
 
-import asrpy as asr
 import mne
 import numpy as np
 import pandas as pd
-import pyprep as prep
+
+
+@functools.lru_cache(maxsize=8)
+def _get_standard_montage(montage_name: str) -> mne.channels.DigMontage:
+    """Cached wrapper around mne.channels.make_standard_montage.
+
+    The montage file is only parsed once per process. The returned object is
+    shared between calls, mne copies it when it is set on a raw object.
+
+    Args:
+        montage_name (str): the name of the standard montage
+
+    Returns:
+        mne.channels.DigMontage: the standard montage
+    """
+    return mne.channels.make_standard_montage(montage_name)
 
 
 class CSTpreprocessing:
@@ -48,49 +62,52 @@ class CSTpreprocessing:
     ) -> None:
         """Constructor for the CSTpreprocessing object.
 
+        The EEG data are not loaded in memory until a step that needs them
+        (PREP or ASR) is run.
+
         Args:
             eeg_filename (str or os.PathLike): the path to the EEG file
             events_filename (str or os.PathLike): the path to the events file
         """
         self.eeg_filename = eeg_filename
         self.events_filename = events_filename
-        self.raw = mne.io.read_raw(eeg_filename, preload=True)
-        self.events = pd.read_csv(events_filename)
+        self.raw = mne.io.read_raw(eeg_filename, preload=False)
+        self.events = pd.read_csv(
+            events_filename, usecols=["timestamps", "StimMarkers_alpha"]
+        )
+        self.process_history: list[str] = list()
 
     def set_annotations_to_raw(self) -> "CSTpreprocessing":
         """Automatically set the annotations on the raw object.
 
-        It takes care of the subtelties of the CST dataset. It handles correctly
-        the timestamps and the timezone set.
+        It takes care of the subtelties of the CST dataset. The event timestamps
+        are Unix epoch seconds and are read as UTC, whatever the local timezone
+        of the machine, to match the measurement date that MNE stores in UTC.
+        The onsets are the seconds elapsed since the measurement date,
+        including their fractional part.
 
         Returns:
             self
         """
-        events_renamed = self.events.copy()
-        events_renamed.loc[
-            events_renamed["StimMarkers_alpha"].str.contains("Crash"),
-            "StimMarkers_alpha",
-        ] = "Crash"
+        markers = self.events["StimMarkers_alpha"]
+        markers = markers.mask(markers.str.contains("Crash", regex=False), "Crash")
 
-        timestamp = [
-            datetime.datetime.fromtimestamp(t) for t in events_renamed["timestamps"]
-        ]
+        timestamps = pd.to_datetime(self.events["timestamps"], unit="s", utc=True)
 
-        events_renamed["timestamps"] = [
-            t.replace(tzinfo=datetime.timezone.utc) for t in timestamp
-        ]
-
-        description = events_renamed["StimMarkers_alpha"].values
-
-        onsets = [
-            t.seconds for t in events_renamed["timestamps"] - self.raw.info["meas_date"]
-        ]
+        onsets = (
+            (timestamps - pd.Timestamp(self.raw.info["meas_date"]))
+            .dt.total_seconds()
+            .to_numpy()
+        )
+        durations = np.zeros_like(onsets)
+        descriptions = markers.to_numpy()
 
         self.annotations = self.raw.annotations.append(
-            onset=onsets, duration=np.zeros((len(onsets))), description=description
+            onset=onsets, duration=durations, description=descriptions
         )
 
         self.raw.set_annotations(self.annotations)
+        self.process_history.append("ANNOTATIONS")
         return self
 
     def set_montage(self) -> "CSTpreprocessing":
@@ -102,16 +119,26 @@ class CSTpreprocessing:
         Returns:
              CSTpreprocessing object
         """
-        self.montage = mne.channels.make_standard_montage("easycap-M1")
+        self.montage = _get_standard_montage("easycap-M1")
         self.raw.set_montage(self.montage)
+        self.process_history.append("MONTAGE")
         return self
 
     def run_prep(self) -> "CSTpreprocessing":
         """Run the pyprep pipeline on the raw object.
 
+        The montage is set first if it has not been set yet.
+
         Returns:
             CSTpreprocessing object
         """
+        # pyprep is only imported when needed as it is slow to import
+        import pyprep as prep
+
+        if "MONTAGE" not in self.process_history:
+            self.set_montage()
+
+        self.raw.load_data()
         prep_params = {
             "ref_chs": "eeg",
             "reref_chs": "eeg",
@@ -122,6 +149,7 @@ class CSTpreprocessing:
         )
         prep_obj.fit()
         self.raw = prep_obj.raw_eeg
+        self.process_history.append("PREP")
         return self
 
     def run_asr(self) -> "CSTpreprocessing":
@@ -130,10 +158,16 @@ class CSTpreprocessing:
         Returns:
             CSTpreprocessing object
         """
+        # asrpy is only imported when needed as it is slow to import
+        import asrpy as asr
+
+        self.raw.load_data()
         asr_obj = asr.ASR(sfreq=self.raw.info["sfreq"], cutoff=10)
         asr_obj.fit(self.raw)
         self.raw = asr_obj.transform(self.raw)
-        self.raw.set_annotations(self.annotations)
+        if "ANNOTATIONS" in self.process_history:
+            self.raw.set_annotations(self.annotations)
+        self.process_history.append("ASR")
         return self
 
     def save(self, filename: str | os.PathLike) -> "CSTpreprocessing":
@@ -28,7 +28,6 @@
 """GENERAL DOCUMENTATION HERE."""
 
 import mne
-import numpy as np
 
 from eeg_research.preprocessing.tools.gradient_remover import GradientRemover
 
@@ -53,9 +52,9 @@ def extract_gradient_trigger_name(
     Raises:
         Exception: No gradient trigger found.
     """
-    annotations_names = np.unique(raw.annotations.description)
-    for annotation_name in annotations_names:
-        if desired_trigger_name.lower() in annotation_name.lower():
+    trigger_name = desired_trigger_name.lower()
+    for annotation_name in raw.annotations.description:
+        if trigger_name in annotation_name.lower():
             return annotation_name
 
     raise Exception("No gradient trigger found.")
@@ -30,6 +30,9 @@
 import numpy as np
 from scipy.signal import detrend
 
+# Size of the blocks of TRs GradientRemover.correct works on, in float64 bytes
+BLOCK_BYTES = 4 * 1024**2
+
 
 class GradientRemover:
     """A class to remove gradients from EEG data using a template approach."""
@@ -44,7 +47,10 @@ class GradientRemover:
 
         Args:
             eeg_data (np.ndarray): The raw EEG data to perform gradient correction on.
-                Expected in shape (channels, time_points).
+                Expected in shape (channels, time_points). The correction
+                keeps the dtype of floating-point data, so float32 data is
+                processed in float32 end to end. Other data is converted to
+                float64, as scipy's detrend would do.
             tr_events (np.ndarray): The sample numbers for when TRs begin. The array
                 may be a subset of an mne find_events that is a shape (N, 3), or a
                 1-dimensional array of sample numbers. TRs must be perfectly
@@ -60,27 +66,34 @@ class GradientRemover:
         Raises:
             ValueError: if any inputs are invalid.
         """
-        self._window = GradientRemover._valid_window(self, window)
-        self._tr_events = GradientRemover._valid_tr_events(self, tr_events)
+        self._window = self._valid_window(window)
+        self._tr_events = self._valid_tr_events(tr_events)
         if self._tr_events[-1] > eeg_data.shape[1]:
             raise ValueError(
                 f"Last TR event is sample {self._tr_events[-1]} but "
                 f"eeg data only contains {eeg_data.shape[1]} samples. "
                 "Please check your tr event markers."
             )
-        self._data = eeg_data
         self._raw = eeg_data  # placeholder for raw data
+        if not np.issubdtype(eeg_data.dtype, np.floating):
+            eeg_data = eeg_data.astype(np.float64)
+        self._data = eeg_data
+        # Fixed by the inputs, computed once instead of on every access
+        self._tr_spacing = int(self._tr_events[1] - self._tr_events[0])
+        self._n_tr = len(self._tr_events)
+        self._n_channels = len(self._data)
         # Get weights for template
         window_total = self.window[0] + self.window[1]
         self._weight_before = self.window[0] / window_total
         self._weight_after = self.window[1] / window_total
         # Lazy evaluation
-        self._corrected = eeg_data
+        self._corrected: np.ndarray | None = None
+        self._detrended: np.ndarray | None = None
 
     @property
     def corrected(self) -> np.ndarray:
         """The gradient-corrected data."""
-        if self._corrected:
+        if self._corrected is not None:
             return self._corrected
         else:
             return self.correct()
@@ -98,17 +111,17 @@ class GradientRemover:
     @property
     def tr_spacing(self) -> int:
         """The time between TRs in samples."""
-        return self._tr_events[1] - self._tr_events[0]
+        return self._tr_spacing
 
     @property
     def n_tr(self) -> int:
         """The number of TRs in the data."""
-        return len(self._tr_events)
+        return self._n_tr
 
     @property
     def n_channels(self) -> int:
         """The number of channels in the data."""
-        return len(self._data)
+        return self._n_channels
 
     def get_tr(self, n: int) -> np.ndarray:
         """Get the uncorrected data at a given TR.
@@ -139,7 +152,41 @@ class GradientRemover:
         Raises:
             ValueError: If an invalid TR index is supplied.
         """
-        return detrend(self.get_tr(n))
+        self._check_valid_tr(n)
+        return self._get_detrended()[n]
+
+    def _get_detrended(self) -> np.ndarray:
+        """Detrend every TR at once and cache the result.
+
+        Only the per-TR accessors use this cache, correct() detrends into its
+        output instead so that it does not keep a second copy of the data.
+
+        Returns:
+            np.ndarray: The detrended data of every TR,
+                with shape (tr, channels, tr_timepoints).
+        """
+        if self._detrended is None:
+            self._detrended = detrend(self._as_trs(self._data), axis=-1)
+        return self._detrended
+
+    def _as_trs(self, data: np.ndarray) -> np.ndarray:
+        """View the TRs of the data as a (tr, channels, tr_timepoints) array.
+
+        The TRs are perfectly spaced, so the data they cover can be reshaped
+        without copying.
+
+        Args:
+            data (np.ndarray): Data with the same shape as the EEG data.
+
+        Returns:
+            np.ndarray: A view of the TRs, with shape (tr, channels, tr_timepoints).
+        """
+        first_start, _ = self._tr_bounds(0)
+        _, last_end = self._tr_bounds(self.n_tr - 1)
+        trs = data[:, first_start:last_end].reshape(
+            self.n_channels, self.n_tr, self.tr_spacing
+        )
+        return np.moveaxis(trs, 1, 0)
 
     def get_tr_template(self, n: int) -> np.ndarray:
         """Get the gradient template data at a given TR.
@@ -155,16 +202,18 @@ class GradientRemover:
             ValueError: If an invalid TR index is supplied.
         """
         self._check_valid_tr(n)
-        if n < self.window[0] or n > (self.n_tr - self.window[1]):
-            return np.zeros((self.n_channels, self.tr_spacing))
+        if n < self.window[0] or n > (self.n_tr - 1 - self.window[1]):
+            return np.zeros((self.n_channels, self.tr_spacing), dtype=self._data.dtype)
         if self.window[0]:
             before = self._get_tr_template_part(n - self.window[0], n)
         else:
-            before = np.zeros((self.n_channels, self.tr_spacing))
+            before = np.zeros(
+                (self.n_channels, self.tr_spacing), dtype=self._data.dtype
+            )
         if self.window[1]:
-            after = self._get_tr_template_part(n + 1, n + self.window[1] - 1)
+            after = self._get_tr_template_part(n + 1, n + 1 + self.window[1])
         else:
-            after = np.zeros((self.n_channels, self.tr_spacing))
+            after = np.zeros((self.n_channels, self.tr_spacing), dtype=self._data.dtype)
         return self._weight_before * before + self._weight_after * after
 
     def _get_tr_template_part(self, start: int, stop: int) -> np.ndarray:
@@ -177,9 +226,7 @@ class GradientRemover:
         Returns:
             np.ndarray: The template part of the time series data.
         """
-        return np.mean(
-            np.asarray([self.get_tr_detrended(tr) for tr in range(start, stop)]), axis=0
-        )
+        return np.mean(self._get_detrended()[start:stop], axis=0)
 
     def get_tr_corrected(self, n: int) -> np.ndarray:
         """Get the gradient-corrected data at a given TR.
@@ -200,14 +247,79 @@ class GradientRemover:
 
     def correct(self) -> np.ndarray:
         """Generate the gradient-corrected data."""
-        corrected = self._data.copy()
-        for tr in range(self.n_tr):
-            this_start, this_end = self._tr_bounds(tr)
-            corrected[:, this_start:this_end] = self.get_tr_corrected(tr)
+        first_start, _ = self._tr_bounds(0)
+        _, last_end = self._tr_bounds(self.n_tr - 1)
+        # Only the samples outside of the TRs are copied from the raw data,
+        # the TRs are written in place and corrected there.
+        corrected = np.empty(self._data.shape, dtype=self._data.dtype)
+        corrected[:, :first_start] = self._data[:, :first_start]
+        corrected[:, last_end:] = self._data[:, last_end:]
+        tr_view = self._as_trs(corrected)
+        trs = self._as_trs(self._data)
+        block_size = self._get_block_size()
+        for start in range(0, self.n_tr, block_size):
+            stop = start + block_size
+            tr_view[start:stop] = detrend(trs[start:stop], axis=-1)
+        self._subtract_templates(tr_view)
         self._corrected = corrected
         return corrected
 
-    def _valid_window(self, window: int | tuple[int, int]) -> tuple[int, int]:
+    def _subtract_templates(self, trs: np.ndarray) -> None:
+        """Subtract the gradient template of every TR in place.
+
+        The TRs are corrected block by block to keep the temporaries small. The
+        sum over each template window is the difference of two slices of a
+        cumulative sum over the TRs of the block and their neighbours, so every
+        TR is only summed once whatever the window size. TRs without a full
+        window are left as is.
+
+        Args:
+            trs (np.ndarray): The detrended data of every TR,
+                with shape (tr, channels, tr_timepoints).
+        """
+        before, after = self.window
+        block_size = self._get_block_size()
+        # Uncorrected copy of the TRs preceding the current block, which have
+        # already been corrected in place by then.
+        previous = trs[:before].astype(np.float64)
+        for start in range(before, self.n_tr - after, block_size):
+            stop = min(start + block_size, self.n_tr - after)
+            count = stop - start
+            # The running sum stays in float64 even for float32 data: the window
+            # sums are differences of two large sums and would lose precision.
+            cumulative = np.zeros((before + count + after + 1, *trs.shape[1:]))
+            np.cumsum(previous, axis=0, out=cumulative[1 : before + 1])
+            np.cumsum(
+                trs[start : stop + after],
+                axis=0,
+                dtype=np.float64,
+                out=cumulative[before + 1 :],
+            )
+            cumulative[before + 1 :] += cumulative[before]
+            previous = np.concatenate((previous, trs[start:stop]))[count:]
+            if before:
+                window_sum = cumulative[before : before + count] - cumulative[:count]
+                window_sum *= self._weight_before / before
+                trs[start:stop] -= window_sum
+            if after:
+                window_sum = (
+                    cumulative[before + 1 + after :]
+                    - cumulative[before + 1 : before + 1 + count]
+                )
+                window_sum *= self._weight_after / after
+                trs[start:stop] -= window_sum
+
+    def _get_block_size(self) -> int:
+        """Number of TRs processed at once by the whole-recording correction.
+
+        Returns:
+            int: The number of TRs whose float64 copy fits in BLOCK_BYTES.
+        """
+        tr_bytes = self.n_channels * self.tr_spacing * np.dtype(np.float64).itemsize
+        return max(1, BLOCK_BYTES // tr_bytes)
+
+    @staticmethod
+    def _valid_window(window: int | tuple[int, int]) -> tuple[int, int]:
         """Validates the window parameter for the GradientRemover class.
 
         Args:
@@ -233,8 +345,8 @@ class GradientRemover:
         else:
             raise TypeError(
                 "Window must be a positive, even integer or a tuple of "
-                "size 2 containing a positive integer."
-                "(Received {window})."
+                "size 2 containing a positive integer. "
+                f"(Received {window})."
             )
         if window[0] < 0 or window[1] < 0:
             raise ValueError(
@@ -246,26 +358,24 @@ class GradientRemover:
             )
         return window
 
-    def _valid_tr_events(self, tr_events: np.ndarray) -> np.ndarray:
-        # Check to make sure TRs are evenly spaced
-        if len(tr_events.shape) == 2:
-            if tr_events.shape[1] == 3:
-                tr_events = tr_events[:, 0]
-            else:
-                raise ValueError(
-                    "TRs must be a 1D array or a (N, 3) ndarray from mne. "
-                    f"Received array of shape {tr_events.shape}."
-                )
-        elif len(tr_events.shape) != 1:
+    @staticmethod
+    def _valid_tr_events(tr_events: np.ndarray) -> np.ndarray:
+        if tr_events.ndim == 2 and tr_events.shape[1] == 3:
+            tr_events = tr_events[:, 0]
+        elif tr_events.ndim != 1:
             raise ValueError(
                 "TRs must be a 1D array or a (N, 3) ndarray from mne. "
                 f"Received array of shape {tr_events.shape}."
             )
-        unique = np.unique(np.diff(tr_events))
-        if len(unique) != 1:
+        tr_events = np.ascontiguousarray(tr_events, dtype=np.int64)
+        # Check to make sure TRs are evenly spaced
+        spacings = np.diff(tr_events)
+        # A single comparison pass; the sorted unique distances are only
+        # needed for the error message.
+        if spacings.size == 0 or not np.all(spacings == spacings[0]):
             raise ValueError(
                 "TR spacings are not consistent; the following unique "
-                f"distances were present: {unique}."
+                f"distances were present: {np.unique(spacings)}."
             )
         return tr_events
 
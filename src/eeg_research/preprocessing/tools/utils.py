@@ -29,64 +29,56 @@
 
 import os
 import warnings
+from pathlib import Path
 
 import mne
-import numpy as np
 
+# Reader of each supported file extension (lower case), looked up once per call.
+READERS = {
+    ".mff": mne.io.read_raw_egi,
+    ".raw": mne.io.read_raw_egi,
+    ".bdf": mne.io.read_raw_bdf,
+    ".edf": mne.io.read_raw_edf,
+    ".fif": mne.io.read_raw_fif,
+    ".set": mne.io.read_raw_eeglab,
+    ".vhdr": mne.io.read_raw_brainvision,
+}
 
-def read_raw_eeg(filename: str, preload: bool = False) -> mne.io.Raw:
+
+def read_raw_eeg(filename: str, preload: bool | str = False) -> mne.io.Raw:
     """Read raw EEG data from a file.
 
     Wrapper function around mne.io.read_raw_* functions
     to chose the right reading method based on the file extension.
 
-    Format  of the fileallowed are:
-    - egi (.mff, .RAW)
+    Format of the file allowed are (the extension is not case sensitive):
+    - egi (.mff, .raw)
     - bdf (.bdf)
     - edf (.edf)
     - fif (.fif)
     - eeglab (.set)
-    - brainvision (.eeg)
+    - brainvision (.vhdr)
 
     Args:
         filename (str): path to the file
-        preload (bool, optional): if True, the data will be preloaded into memory.
-            Defaults to False.
+        preload (bool | str, optional): if True, the data will be preloaded into
+            memory. If a string, it is the path of a file used to memory-map
+            the data instead of holding it in RAM. Defaults to False.
 
     Raises:
         FileNotFoundError: if the specified file does not exist.
+        ValueError: if the file extension is not supported.
 
     Returns:
         raw (mne.io.Raw): MNE raw object
     """
-    if os.path.exists(filename):
-        extension = os.path.splitext(filename)[1]
-        if extension == ".mff" or extension == ".RAW":
-            method = "read_raw_egi"
-        elif extension == ".bdf":
-            method = "read_raw_bdf"
-        elif extension == ".edf":
-            method = "read_raw_edf"
-        elif extension == ".fif":
-            method = "read_raw_fif"
-        elif extension == ".set":
-            method = "read_raw_eeglab"
-        elif extension == ".vhdr":
-            method = "read_raw_brainvision"
-
-        reader = getattr(mne.io, method)
-        try:
-            raw = reader(filename, preload=preload)
-            return raw
-
-        except mne.io.ReadingFileError:
-            print(
-                f"File {filename} is corrupted or "
-                f"extension {extension} is not recognized"
-            )
+    # No existence check here: every reader raises FileNotFoundError itself.
+    extension = os.path.splitext(filename)[1]
+    reader = READERS.get(extension.lower())
+    if reader is None:
+        raise ValueError(f"Extension {extension} is not supported")
 
-    else:
-        raise FileNotFoundError(f"File {filename} does not exist")
+    return reader(filename, preload=preload)
 
 
 def save_clean_eeg(raw: mne.io.Raw, file: str, scripts: list[str]) -> None:
@@ -97,18 +89,27 @@ def save_clean_eeg(raw: mne.io.Raw, file: str, scripts: list[str]) -> None:
         file (str): path to the original file.
         scripts (list[str]): list of scripts used for cleaning the data.
     """
-    base_filepath, _ = os.path.splitext(file)
-    destination_path = (
-        base_filepath.split("sub-", 1)[0]
-        + "derivatives/sub-"
-        + base_filepath.split("sub-", 1)[1]
+    path = Path(file)
+    folders = path.parts[:-1]
+    subject_index = next(
+        (index for index, folder in enumerate(folders) if folder.startswith("sub-")),
+        None,
     )
+    if subject_index is None:
+        raise ValueError(f"File {file} is not in a BIDS subject folder")
+
     scripts_str = "_".join(scripts) + "_clean_eeg"
-    destination_path = destination_path.replace(
-        "/eeg/sub-", "/" + scripts_str + "/sub-"
+    # <root>/derivatives/sub-*/.../<scripts_str>/<entities>_<scripts_str>.fif
+    entity_folders = list(folders[subject_index:])
+    if entity_folders[-1] == "eeg":
+        entity_folders[-1] = scripts_str
+    saving_filename = Path(
+        *folders[:subject_index],
+        "derivatives",
+        *entity_folders,
+        path.stem.removesuffix("eeg") + scripts_str + ".fif",
     )
-    saving_filename = destination_path[:-3] + scripts_str + ".fif"
-    os.makedirs(os.path.dirname(saving_filename), exist_ok=True)
+    saving_filename.parent.mkdir(parents=True, exist_ok=True)
     raw.save(saving_filename, overwrite=True)
 
 
@@ -126,11 +127,8 @@ def find_real_channel_name(raw: mne.io.Raw, name: str = "ecg") -> list:
     Returns:
         str: The real name of the channel in the raw object.
     """
-    channel_found = list()
-    for ch_name in raw.info["ch_names"]:
-        if name.lower() in ch_name.lower():
-            channel_found.append(ch_name)
-    return channel_found
+    target = name.casefold()
+    return [ch_name for ch_name in raw.info["ch_names"] if target in ch_name.casefold()]
 
 
 def map_channel_type(raw: mne.io.Raw) -> dict:
@@ -142,16 +140,18 @@ def map_channel_type(raw: mne.io.Raw) -> dict:
     Returns:
         dict: dictionary of channel type to map into `raw.set_channel_types` method
     """
+    ch_types = ["ecg", "eog"]
     channels_mapping = dict()
-    for ch_type in ["ecg", "eog"]:
-        ch_name_in_raw = find_real_channel_name(raw, ch_type)
-        if ch_name_in_raw:
-            if len(ch_name_in_raw) == 1:
-                channels_mapping.update({ch_name_in_raw[0]: ch_type})
-            elif len(ch_name_in_raw) > 1:
-                for name in ch_name_in_raw:
-                    channels_mapping.update({name: ch_type})
-        else:
+    # Single pass over the channels, each name is lowered only once
+    for ch_name in raw.info["ch_names"]:
+        lowered_name = ch_name.lower()
+        for ch_type in ch_types:
+            if ch_type in lowered_name:
+                channels_mapping[ch_name] = ch_type
+
+    types_found = set(channels_mapping.values())
+    for ch_type in ch_types:
+        if ch_type not in types_found:
             print(f"No {ch_type.upper()} channel found.")
             if ch_type == "eog":
                 print("Fp1 and Fp2 will be used for EOG signal detection")
@@ -196,9 +196,9 @@ def extract_gradient_trigger_name(
     Raises:
         Exception: No gradient trigger found.
     """
-    annotations_names = np.unique(raw.annotations.description)
-    for annotation_name in annotations_names:
-        if desired_trigger_name.lower() in annotation_name.lower():
+    trigger_name = desired_trigger_name.lower()
+    for annotation_name in raw.annotations.description:
+        if trigger_name in annotation_name.lower():
             return annotation_name
 
     if on_missing == "ignore":
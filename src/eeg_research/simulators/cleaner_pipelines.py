@@ -61,7 +61,7 @@ class CleanerPipelines:
         self._make_derivatives_path()
 
     def _task_is(self, task_name: str) -> bool:
-        return self.BIDSFile.get_entities()["task"] == task_name
+        return self.entities["task"] == task_name
 
     def read_raw(self: "CleanerPipelines") -> "CleanerPipelines":
         """Read the raw EEG data using MNE."""
@@ -1,6 +1,7 @@
 """The module to handle the directory tree."""
 
 import os
+from pathlib import Path
 from typing import Generator
 
 
@@ -9,7 +10,9 @@ class DirectoryTree:
 
     def __init__(self, root_dir: str | os.PathLike) -> None:
         """Initialize the class with the root directory."""
-        self.root_dir = os.path.abspath(root_dir)
+        # Resolved like the directories of change_directory so that both
+        # compare equal even when the root is behind a symlink
+        self.root_dir = str(Path(root_dir).resolve())
         self.current_dir = self.root_dir
 
     def generate_tree(
@@ -44,11 +47,11 @@ class DirectoryTree:
         Args:
             target_dir (str | os.PathLike): The target directory path.
         """
-        new_dir = os.path.abspath(os.path.join(self.current_dir, target_dir))
-        if os.path.commonpath([self.root_dir, new_dir]) != self.root_dir:
+        new_dir = Path(self.current_dir, target_dir).resolve()
+        if not new_dir.is_relative_to(self.root_dir):
             return f"Error: {new_dir} is not a subdirectory of the root directory."
-        if os.path.isdir(new_dir):
-            self.current_dir = new_dir
+        if new_dir.is_dir():
+            self.current_dir = str(new_dir)
             return f"Changed current directory to {self.current_dir}"
         else:
             return f"Error: Directory {new_dir} does not exist."
@@ -60,8 +63,9 @@ class DirectoryTree:
     ) -> None:
         """Print the tree in a formated way.
 
-        Recursively prints the directory tree starting f
-        rom start_path with proper formatting.
+        Prints the directory tree starting from start_path with proper
+        formatting. The tree is walked depth first with an explicit stack
+        instead of recursion, and each directory is scanned only once.
 
         Args:
             start_path (str | os.PathLike, optional): The starting path.
@@ -73,17 +77,41 @@ class DirectoryTree:
             start_path = self.root_dir
             print(start_path + "/")
 
-        entries = [entry for entry in os.scandir(str(start_path))]
-        entries = sorted(entries, key=lambda e: (e.is_file(), e.name))
+        # Lines still to be printed, the next one at the end of the list.
+        pending = self._tree_lines(str(start_path), str(prefix))[::-1]
+        while pending:
+            line, directory, child_prefix = pending.pop()
+            print(line)
+            if directory is not None:
+                pending.extend(self._tree_lines(directory, child_prefix)[::-1])
+
+    @staticmethod
+    def _tree_lines(path: str, prefix: str) -> list[tuple[str, str | None, str]]:
+        """Format the entries of a directory for print_tree.
+
+        Args:
+            path (str): The directory to scan.
+            prefix (str): The prefix of the lines of this directory.
+
+        Returns:
+            list[tuple[str, str | None, str]]: For each entry, directories
+                first, the line to print, the path to descend into (None for
+                files) and the prefix of its own entries.
+        """
+        with os.scandir(path) as it:
+            # is_dir is read once per entry from the DirEntry
+            entries = [(entry.is_dir(), entry.name, entry.path) for entry in it]
+        entries.sort(key=lambda entry: (not entry[0], entry[1]))
         last_index = len(entries) - 1
 
-        for index, entry in enumerate(entries):
+        lines: list[tuple[str, str | None, str]] = list()
+        for index, (is_dir, name, entry_path) in enumerate(entries):
             connector = "├──" if index != last_index else "└──"
-            if entry.is_dir():
-                print(f"{prefix}{connector} {entry.name}/")
+            if is_dir:
                 extension = "│   " if index != last_index else "    "
-                self.print_tree(
-                    os.path.join(start_path, entry.name), str(prefix) + str(extension)
+                lines.append(
+                    (f"{prefix}{connector} {name}/", entry_path, prefix + extension)
                 )
             else:
-                print(f"{prefix}{connector} {entry.name}")
+                lines.append((f"{prefix}{connector} {name}", None, prefix))
+        return lines
@@ -1,8 +1,11 @@
 """Simulate EEG data for testing purposes."""
 
+import csv
+import itertools
 import json
 import shutil
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +18,43 @@ from mne.io import RawArray
 
 from eeg_research.simulators.path_handler import DirectoryTree
 
+# File extension written for each supported format, fif by raw.save and the
+# others by mne.export.export_raw
+EEG_EXTENSIONS = {
+    "brainvision": ".vhdr",
+    "edf": ".edf",
+    "eeglab": ".set",
+    "fif": ".fif",
+}
+
+# Content of the EEG sidecar JSON, the same for every simulated run, so it is
+# serialized only once
+SIDECAR_JSON = json.dumps(
+    {
+        "SamplingFrequency": 2400,
+        "Manufacturer": "Brain Products",
+        "ManufacturersModelName": "BrainAmp DC",
+        "CapManufacturer": "EasyCap",
+        "CapManufacturersModelName": "M1-ext",
+        "PowerLineFrequency": 50,
+        "EEGReference": "single electrode placed on FCz",
+        "EEGGround": "placed on AFz",
+        "SoftwareFilters": {
+            "Anti-aliasing filter": {
+                "half-amplitude cutoff (Hz)": 500,
+                "Roll-off": "6dB/Octave",
+            }
+        },
+        "HardwareFilters": {
+            "ADC's decimation filter (hardware bandwidth limit)": {
+                "-3dB cutoff point (Hz)": 480,
+                "Filter order sinc response": 5,
+            }
+        },
+    },
+    indent=4,
+)
+
 # TODO:
 #   - refactor the eeg dataset generation with the newly populate labels method
 #   - add the simulation of:
@@ -148,6 +188,33 @@ def simulate_eeg_data(
     return raw
 
 
+def export_simulated_eeg_file(
+    filename: Path, fmt: str, light: bool, simulation_kwargs: dict[str, Any]
+) -> None:
+    """Simulate one EEG recording and export it to a file.
+
+    Module-level so that it can be dispatched to worker processes.
+
+    Args:
+        filename (Path): The path of the exported file.
+        fmt (str): The format of the file, one of EEG_EXTENSIONS. fif is MNE's
+            own format and is written by raw.save, the other formats by
+            mne.export.export_raw.
+        light (bool): Whether to simulate light EEG data.
+        simulation_kwargs (dict[str, Any]): The parameters to pass to the EEG
+            data simulation function.
+    """
+    if light:
+        raw = simulate_light_eeg_data(**simulation_kwargs)
+    else:
+        raw = simulate_eeg_data(**simulation_kwargs)
+
+    if fmt == "fif":
+        raw.save(filename, overwrite=True)
+    else:
+        mne.export.export_raw(fname=filename, raw=raw, fmt=fmt, overwrite=True)
+
+
 class DummyDataset:
     """A class to create a dummy BIDS dataset for EEG data.
 
@@ -168,6 +235,7 @@ class DummyDataset:
         data_folder: str = "RAW",
         root: str | Path | None = None,
         flush: bool = True,
+        jobs: int = 1,
     ) -> None:
         """Initialize the DummyDataset object.
 
@@ -190,9 +258,11 @@ class DummyDataset:
                 temporary directory of the system. Defaults to None.
             flush (bool, optional): Whether to remove the temporary directory
                 when the object is deleted. Defaults to True.
+            jobs (int, optional): The number of files create_eeg_dataset
+                simulates in parallel. Defaults to 1.
         """
-        arguments_to_check = [n_subjects, n_sessions, n_runs]
-        arguments_name = ["subjects", "sessions", "runs"]
+        arguments_to_check = [n_subjects, n_sessions, n_runs, jobs]
+        arguments_name = ["subjects", "sessions", "runs", "jobs"]
         print(arguments_name)
         conditions = [
             not isinstance(argument, int) or argument < 1
@@ -216,6 +286,7 @@ class DummyDataset:
         self.n_subjects = n_subjects
         self.n_sessions = n_sessions
         self.n_runs = n_runs
+        self.jobs = jobs
         self.data_folder = data_folder
         self.sessions_label_str = sessions_label_str
         self.subjects_label_str = subjects_label_str
@@ -228,6 +299,30 @@ class DummyDataset:
         )
         self.root = Path(self.temporary_directory.name)
         self.bids_path = self.root.joinpath(self.data_folder)
+        self._participant_metadata = pd.DataFrame(
+            columns=["participant_id", "sex", "age", "handedness"]
+        )
+        # Rows added one by one, concatenated only when the metadata is read
+        self._pending_participants: list[dict[str, Any]] = list()
+
+    @property
+    def participant_metadata(self) -> pd.DataFrame:
+        """The participant metadata, including the participants added since."""
+        if self._pending_participants:
+            self._participant_metadata = pd.concat(
+                [
+                    self._participant_metadata,
+                    pd.DataFrame(self._pending_participants),
+                ],
+                ignore_index=True,
+            )
+            self._pending_participants = list()
+        return self._participant_metadata
+
+    @participant_metadata.setter
+    def participant_metadata(self, participant_metadata: pd.DataFrame) -> None:
+        self._participant_metadata = participant_metadata
+        self._pending_participants = list()
 
     def _create_participant_metadata(self) -> "DummyDataset":
         """Create participant metadata for the dataset.
@@ -235,25 +330,23 @@ class DummyDataset:
         Returns:
             DummyDataset: The DummyDataset object.
         """
-        holder: dict[str, list[Any]] = {
-            "participant_id": [],
-            "sex": [],
-            "age": [],
-            "handedness": [],
-        }
-        for subject_number in range(1, self.n_subjects + 1):
-            holder["age"].append(np.random.randint(18, 60))
-            holder["sex"].append(np.random.choice(["M", "F"]))
-            holder["handedness"].append(
-                np.random.choice(["right", "left", "ambidextrous"])
-            )
-            holder["participant_id"].append(
+        # One draw per column for all the subjects at once, from the global
+        # random state so that np.random.seed keeps the metadata reproducible
+        holder: dict[str, list[Any] | np.ndarray] = {
+            "participant_id": [
                 self._generate_label(
                     "subjects",
                     label_number=subject_number,
                     label_str_id=self.subjects_label_str,
                 )
-            )
+                for subject_number in range(1, self.n_subjects + 1)
+            ],
+            "sex": np.random.choice(["M", "F"], size=self.n_subjects),
+            "age": np.random.randint(18, 60, size=self.n_subjects),
+            "handedness": np.random.choice(
+                ["right", "left", "ambidextrous"], size=self.n_subjects
+            ),
+        }
 
         self.participant_metadata = pd.DataFrame(holder)
         self.subjects = self.participant_metadata["participant_id"].tolist()
@@ -270,21 +363,16 @@ class DummyDataset:
             sex (str): The sex of the participant.
             handedness (str): The handedness of the participant.
         """
-        if not hasattr(self, "participant_metadata"):
+        if self._participant_metadata.empty:
             self._create_participant_metadata()
 
-        temp_df = pd.DataFrame(
+        self._pending_participants.append(
             {
                 "participant_id": participant_id,
                 "age": age,
                 "sex": sex,
                 "handedness": handedness,
-            },
-            index=[0],
-        )
-
-        self.participant_metadata = pd.concat(
-            [self.participant_metadata, temp_df], ignore_index=True
+            }
         )
 
     def _populate_labels(self) -> "DummyDataset":
@@ -309,7 +397,12 @@ class DummyDataset:
     def _save_participant_metadata(self) -> None:
         """Save the participant metadata to a file."""
         saving_filename = self.bids_path.joinpath("participants.tsv")
-        self.participant_metadata.to_csv(saving_filename, sep="\t", index=False)
+        participant_metadata = self.participant_metadata
+        # A plain csv writer is enough for this small 4-column table
+        with open(saving_filename, "w", newline="") as participants_file:
+            writer = csv.writer(participants_file, delimiter="\t", lineterminator="\n")
+            writer.writerow(participant_metadata.columns)
+            writer.writerows(participant_metadata.itertuples(index=False))
 
     def _generate_label(
         self: "DummyDataset",
@@ -351,6 +444,15 @@ class DummyDataset:
             List[Path]: The paths of the created folders.
         """
         path_list = list()
+        # The session labels are the same for every subject
+        session_folder_labels = [
+            self._generate_label(
+                label_type="sessions",
+                label_number=session_number,
+                label_str_id=self.sessions_label_str,
+            )
+            for session_number in range(1, self.n_sessions + 1)
+        ]
 
         for subject_number in range(1, self.n_subjects + 1):
             subject_folder_label = self._generate_label(
@@ -359,12 +461,7 @@ class DummyDataset:
                 label_str_id=self.subjects_label_str,
             )
 
-            for session_number in range(1, self.n_sessions + 1):
-                session_folder_label = self._generate_label(
-                    label_type="sessions",
-                    label_number=session_number,
-                    label_str_id=self.sessions_label_str,
-                )
+            for session_folder_label in session_folder_labels:
                 path = self.bids_path.joinpath(
                     subject_folder_label, session_folder_label
                 )
@@ -380,16 +477,22 @@ class DummyDataset:
             path (str | Path): The path to extract the label from.
 
         Returns:
-            str: The extracted label.
-        """
-        path = Path(path)
-        parts = path.parts
-        entities = {
-            "subject": [part for part in parts if "sub-" in part][0],
-            "session": [part for part in parts if "ses-" in part][0],
-        }
+            dict[str, str]: The subject and session folder names.
 
-        return entities
+        Raises:
+            ValueError: If the path has no subject or no session folder.
+        """
+        entities: dict[str, str] = dict()
+        # Single pass over the parts, stopped as soon as both are found
+        for part in Path(path).parts:
+            if "subject" not in entities and part.startswith("sub-"):
+                entities["subject"] = part
+            elif "session" not in entities and part.startswith("ses-"):
+                entities["session"] = part
+            if len(entities) == 2:
+                return entities
+
+        raise ValueError(f"No subject and session folders found in {path}")
 
     def _create_sidecar_json(self, eeg_filename: str | Path) -> None:
         """Create a sidecar JSON file for the EEG data.
@@ -400,31 +503,7 @@ class DummyDataset:
         json_filename = Path(eeg_filename).with_suffix("")
         json_filename = json_filename.with_suffix(".json")
 
-        json_content = {
-            "SamplingFrequency": 2400,
-            "Manufacturer": "Brain Products",
-            "ManufacturersModelName": "BrainAmp DC",
-            "CapManufacturer": "EasyCap",
-            "CapManufacturersModelName": "M1-ext",
-            "PowerLineFrequency": 50,
-            "EEGReference": "single electrode placed on FCz",
-            "EEGGround": "placed on AFz",
-            "SoftwareFilters": {
-                "Anti-aliasing filter": {
-                    "half-amplitude cutoff (Hz)": 500,
-                    "Roll-off": "6dB/Octave",
-                }
-            },
-            "HardwareFilters": {
-                "ADC's decimation filter (hardware bandwidth limit)": {
-                    "-3dB cutoff point (Hz)": 480,
-                    "Filter order sinc response": 5,
-                }
-            },
-        }
-
-        with open(json_filename, "w") as json_file:
-            json.dump(json_content, json_file, indent=4)
+        json_filename.write_text(SIDECAR_JSON)
 
     def _create_dataset_description(self) -> None:
         """Create the dataset_description.json file."""
@@ -435,8 +514,9 @@ class DummyDataset:
             "Authors": ["Jane Doe", "John Doe"],
         }
 
-        with open(self.bids_path / "dataset_description.json", "w") as desc_file:
-            json.dump(self.dataset_description, desc_file, indent=4)
+        self.bids_path.joinpath("dataset_description.json").write_text(
+            json.dumps(self.dataset_description, indent=4)
+        )
 
     def flush(self, check: bool = True) -> None:
         """Remove the temporary directory from memory.
@@ -478,53 +558,71 @@ class DummyDataset:
 
         Returns:
             DummyDataset: : The temporary DummyDataset object.
+
+        Raises:
+            ValueError: If the format is not one of EEG_EXTENSIONS.
         """
+        extension = EEG_EXTENSIONS.get(fmt)
+        if extension is None:
+            raise ValueError(
+                f"Format {fmt} is not supported, use one of {list(EEG_EXTENSIONS)}"
+            )
+
         path_list = self.create_modality_agnostic_dir()
         self._create_dataset_description()
         self._create_participant_metadata()
+        task_label = f"task-{self.task}"
+        run_labels = [
+            self._generate_label("runs", run_number)
+            for run_number in range(1, self.n_runs + 1)
+        ]
 
+        eeg_filenames = list()
         for path in path_list:
-            for run_number in range(1, self.n_runs + 1):
-                run_label = self._generate_label("runs", run_number)
-                eeg_directory = path.joinpath("eeg")
-                eeg_directory.mkdir(parents=True, exist_ok=True)
+            # Everything that only depends on the subject/session folder is
+            # done once per folder instead of once per run
+            eeg_directory = path.joinpath("eeg")
+            eeg_directory.mkdir(parents=True, exist_ok=True)
+            entities = self._extract_entities_from_path(path)
 
+            for run_label in run_labels:
                 # Define file names for EEG data files
-                if fmt == "brainvision":
-                    extension = ".vhdr"
-                elif fmt == "edf":
-                    extension = ".edf"
-                elif fmt == "eeglab":
-                    extension = ".set"
-                elif fmt == "fif":
-                    extension = ".fif"
-
-                entities = self._extract_entities_from_path(path)
-
                 eeg_filename = "_".join(
                     [
                         entities["subject"],
                         entities["session"],
-                        f"task-{self.task}",
+                        task_label,
                         run_label,
                         "eeg",
                     ]
                 )
 
                 eeg_filename += extension
-                eeg_absolute_filename = eeg_directory.joinpath(eeg_filename)
-
-                if light:
-                    raw = simulate_light_eeg_data(**kwargs)  # type: ignore
-                else:
-                    raw = simulate_eeg_data(**kwargs)  # type: ignore
-
-                mne.export.export_raw(
-                    fname=eeg_absolute_filename, raw=raw, fmt=fmt, overwrite=True
+                eeg_filenames.append(eeg_directory.joinpath(eeg_filename))
+
+        # Every recording is independent, they can be simulated in parallel
+        if self.jobs > 1:
+            # Reseed each worker, forked workers would otherwise share the
+            # random state of the parent and simulate identical data
+            with ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=np.random.seed
+            ) as executor:
+                # Consume the results so that errors raised in workers propagate
+                list(
+                    executor.map(
+                        export_simulated_eeg_file,
+                        eeg_filenames,
+                        itertools.repeat(fmt),
+                        itertools.repeat(light),
+                        itertools.repeat(kwargs),
+                    )
                 )
+        else:
+            for eeg_file in eeg_filenames:
+                export_simulated_eeg_file(eeg_file, fmt, light, kwargs)
 
-                # Create sidecar JSON file
-                self._create_sidecar_json(eeg_absolute_filename)
+        for eeg_file in eeg_filenames:
+            self._create_sidecar_json(eeg_file)
 
         self._save_participant_metadata()
         print(f"Temporary BIDS EEG dataset created at {self.bids_path}")
@@ -127,3 +127,24 @@ def test_values_frequency_window(amplitude_spectrum: script.Spectrum) -> None:
     magnitudes = amplitude_spectrum.get_peak_magnitude(frequency_window)
     assert frequency_window[0] <= np.max(magnitudes.peak_frequency_Hz)
     assert frequency_window[1] >= np.max(magnitudes.peak_frequency_Hz)
+
+
+def test_zscore() -> None:
+    """Test the zscore values and the process history of calculate_zscore."""
+    # Long enough for a frequency resolution finer than the bins frequency step
+    raw = simulate_light_eeg_data(n_channels=4, duration=300, sampling_frequency=32)
+    spectrum = script.Spectrum().calculate_fft(raw).calculate_amplitude()
+    spectrum._set_frequency_of_interest(np.full(4, 12.0))
+    amplitude = spectrum.spectrum.copy()
+    amplitude_surrounding_bins = spectrum._get_amplitude_surounding_bins()
+    expected = np.divide(
+        amplitude - np.mean(amplitude_surrounding_bins, axis=1, keepdims=True),
+        np.std(amplitude_surrounding_bins, axis=1, keepdims=True),
+    )
+    history_length = len(spectrum.info["process_history"])
+    spectrum.calculate_zscore()
+    np.testing.assert_allclose(spectrum.spectrum, expected)
+    # The surrounding bins are extracted, and recorded, only once
+    history = spectrum.info["process_history"][history_length:]
+    assert history[1:] == ["Baseline corrected", "Zscore calculated"]
+    assert history[0].startswith("Amplitude of the")
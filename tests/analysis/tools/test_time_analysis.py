@@ -1,10 +1,75 @@
-# ruff: noqa
-# remove the first line after populating the file
+#!/usr/bin/env -S  python  #
+# -*- coding: utf-8 -*-
+# ===============================================================================
+# Author: Dr. Samuel Louviot, PhD
+# Institution: Nathan Kline Institute
+#              Child Mind Institute
+# Address: 140 Old Orangeburg Rd, Orangeburg, NY 10962, USA
+#          215 E 50th St, New York, NY 10022
+# Date: 2024-03-06
+# email: samuel DOT louviot AT nki DOT rfmh DOT org
+# ===============================================================================
+# LICENCE GNU GPLv3:
+# Copyright (C) 2024  Dr. Samuel Louviot, PhD
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ===============================================================================
 
+"""Tests for the time_analysis module."""
+
+import numpy as np
 import pytest
 
 import eeg_research.analysis.tools.time_analysis as script
 
 
-def test_example():
-    assert True
+@pytest.fixture
+def signal() -> np.ndarray:
+    """Create a random (epochs, channels, times) signal."""
+    return np.random.default_rng(0).normal(size=(3, 4, 256))
+
+
+def test_average_rms(signal: np.ndarray) -> None:
+    """Test that average_rms matches the textbook formula along any axis."""
+    for axis in range(signal.ndim):
+        expected = np.sqrt(np.mean(signal**2, axis=axis))
+        np.testing.assert_allclose(script.average_rms(signal, axis=axis), expected)
+
+
+def test_max_gradient(signal: np.ndarray) -> None:
+    """Test that max_gradient is the largest absolute sample-to-sample step."""
+    for axis in range(signal.ndim):
+        expected = np.max(np.abs(np.diff(signal, axis=axis)), axis=axis)
+        np.testing.assert_allclose(script.max_gradient(signal, axis=axis), expected)
+
+
+def test_zero_crossing_rate() -> None:
+    """Test that zero_crossing_rate counts the sign changes."""
+    signal = np.array([[1.0, -1.0, 1.0, -1.0, 1.0], [1.0, 2.0, 3.0, -1.0, -2.0]])
+    np.testing.assert_allclose(script.zero_crossing_rate(signal), [1.0, 0.25])
+
+
+def test_hjorth_complexity(signal: np.ndarray) -> None:
+    """Test that hjorth_complexity is the ratio of the two mobilities."""
+    for axis in range(signal.ndim):
+        expected = script.hjorth_mobility(
+            np.diff(signal, axis=axis), axis=axis
+        ) / script.hjorth_mobility(signal, axis=axis)
+        np.testing.assert_allclose(
+            script.hjorth_complexity(signal, axis=axis), expected
+        )
+
+
+def test_hjorth_parameters(signal: np.ndarray) -> None:
+    """Test that hjorth_parameters matches the individual Hjorth functions."""
+    mobility, complexity = script.hjorth_parameters(signal, axis=2)
+    np.testing.assert_allclose(mobility, script.hjorth_mobility(signal, axis=2))
+    np.testing.assert_allclose(complexity, script.hjorth_complexity(signal, axis=2))
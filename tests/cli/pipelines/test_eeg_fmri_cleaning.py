@@ -1,10 +1,48 @@
-# ruff: noqa
-# remove the first line after populating the file
+"""Tests for eeg_research.cli.pipelines.eeg_fmri_cleaning.py."""
 
 import pytest
+from pyparsing import Any
 
 import eeg_research.cli.pipelines.eeg_fmri_cleaning as script
 
 
-def test_example():
-    assert True
+@pytest.mark.parametrize(
+    "scripts",
+    [
+        [],
+        ["gradient"],
+        ["bcg"],
+        ["qc"],
+        ["gradient", "bcg"],
+        ["gradient", "bcg", "qc"],
+    ],
+)
+def test_clean_file(mocker: Any, scripts: list[str]) -> None:
+    """Test that clean_file runs the selected scripts in order and saves."""
+    raw = mocker.MagicMock(name="raw")
+    gradient_raw = mocker.MagicMock(name="gradient_raw")
+    bcg_raw = mocker.MagicMock(name="bcg_raw")
+    read_raw_eeg = mocker.patch.object(script, "read_raw_eeg", return_value=raw)
+    clean_gradient = mocker.patch.object(
+        script, "clean_gradient", return_value=gradient_raw
+    )
+    clean_bcg = mocker.patch.object(script, "clean_bcg", return_value=bcg_raw)
+    save_clean_eeg = mocker.patch.object(script, "save_clean_eeg")
+
+    script.clean_file("sub-01_task-rest_eeg.vhdr", scripts)
+
+    read_raw_eeg.assert_called_once_with("sub-01_task-rest_eeg.vhdr", preload=True)
+    expected_raw = raw
+    if "gradient" in scripts:
+        clean_gradient.assert_called_once_with(expected_raw)
+        expected_raw = gradient_raw
+    else:
+        clean_gradient.assert_not_called()
+    if "bcg" in scripts:
+        clean_bcg.assert_called_once_with(expected_raw)
+        expected_raw = bcg_raw
+    else:
+        clean_bcg.assert_not_called()
+    save_clean_eeg.assert_called_once_with(
+        expected_raw, "sub-01_task-rest_eeg.vhdr", scripts
+    )
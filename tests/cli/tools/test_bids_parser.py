@@ -74,6 +74,11 @@ def test_bids_parser_set_reading_root(mock_parser: script.BIDSParser) -> None:
     assert result == Path("mock_root/test")
 
 
+def test_bids_parser_get_parser_is_cached() -> None:
+    """Test that the argument parser is only built once."""
+    assert script._get_parser() is script._get_parser()
+
+
 @pytest.mark.parametrize(
     "argv",
     [
@@ -87,6 +92,19 @@ def test_bids_parser_parse_arguments_required_flags(argv: list[str]) -> None:
         run_bids_parser_parse_arguments_test(argv, {})
 
 
+@pytest.mark.parametrize("jobs", ["0", "-2", "two", "1.5"])
+def test_bids_parser_parse_arguments_invalid_jobs(jobs: str) -> None:
+    """Test that --jobs only accepts integers greater than 0."""
+    with pytest.raises(SystemExit):
+        script._get_parser().parse_args(["--root", "root", "--jobs", jobs])
+
+
+def test_bids_parser_parse_arguments_jobs() -> None:
+    """Test that --jobs is parsed as an integer."""
+    args = script._get_parser().parse_args(["--root", "root", "--jobs", "3"])
+    assert args.jobs == 3
+
+
 @pytest.mark.parametrize(
     "argv, expected",
     [
@@ -103,6 +121,8 @@ def test_bids_parser_parse_arguments_required_flags(argv: list[str]) -> None:
                 "datatype": "eeg",
                 "suffix": "eeg",
                 "description": None,
+                "layout_db": None,
+                "jobs": 1,
                 "interactive": False,
                 "gradient": True,
                 "bcg": False,
@@ -185,6 +205,8 @@ def test_bids_parser_parse_arguments_options() -> None:
     [
         (["1", "2", "3"], "*", ["1", "2", "3"]),
         (["1", "2", "3", "4", "5"], "2-4", ["2", "3", "4"]),
+        (["1", "2", "3", "4", "5"], "3-*", ["3", "4", "5"]),
+        ([1, 2, 3], "*-2", [1, 2]),
         (None, "value", "value"),
     ],
 )
@@ -199,6 +221,14 @@ def test_bids_parser_parse_range_args_valid(
     assert mock_parser._parse_range_args("entity", arg) == expected
 
 
+def test_bids_parser_get_entity_ids_cached(mock_parser: script.BIDSParser) -> None:
+    """Test that the layout is only queried once per entity."""
+    mock_parser.layout.get.return_value = ["1", "2", "3"]
+    mock_parser._parse_range_args("subject", "*")
+    mock_parser._parse_range_args("subject", "1-2")
+    mock_parser.layout.get.assert_called_once_with(target="subject", return_type="id")
+
+
 @pytest.mark.parametrize(
     "return_value, arg",
     [
@@ -246,7 +276,9 @@ def test_bids_parser_set_layout(mock_parser: script.BIDSParser, mocker: Any) ->
 
     # Test when args.datafolder is None or doesn't contain "derivatives"
     result = mock_parser._set_layout(mock_indexer)
-    mock_layout.assert_called_with(root=mock_parser.reading_root, indexer=mock_indexer)
+    mock_layout.assert_called_with(
+        root=mock_parser.reading_root, database_path=None, indexer=mock_indexer
+    )
     assert result == mock_layout.return_value
 
     # Test when args.datafolder contains "derivatives"
@@ -256,10 +288,15 @@ def test_bids_parser_set_layout(mock_parser: script.BIDSParser, mocker: Any) ->
         root=mock_parser.reading_root,
         validate=False,
         is_derivative=True,
+        database_path=None,
         indexer=mock_indexer,
     )
     assert result == mock_layout.return_value
 
+    # Test that the layout database folder is forwarded
+    result = mock_parser._set_layout(mock_indexer, "layout_db")
+    assert mock_layout.call_args[1]["database_path"] == "layout_db"
+
 
 def test_bids_parser_set_entities(mock_parser: script.BIDSParser, mocker: Any) -> None:
     """Test the _set_entities method of the BIDSParser class."""
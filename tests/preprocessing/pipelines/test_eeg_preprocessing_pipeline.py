@@ -1,10 +1,62 @@
-# ruff: noqa
-# remove the first line after populating the file
+"""Tests for the eeg_preprocessing_pipeline module."""
 
+import datetime
+import time
+from pathlib import Path
+from typing import Generator
+
+import mne
+import numpy as np
+import pandas as pd
 import pytest
 
 import eeg_research.preprocessing.pipelines.eeg_preprocessing_pipeline as script
 
+MEAS_DATE = datetime.datetime(2024, 3, 1, 17, 0, 0, tzinfo=datetime.timezone.utc)
+
+
+@pytest.fixture
+def local_timezone(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    """Run the test with a local timezone that is not UTC."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def preprocessing(tmp_path: Path) -> script.CSTpreprocessing:
+    """Create a CSTpreprocessing object from a short recording and events."""
+    info = mne.create_info(["Fz", "Cz"], sfreq=100, ch_types="eeg")
+    raw = mne.io.RawArray(np.zeros((2, 6000)), info)
+    raw.set_meas_date(MEAS_DATE)
+    eeg_filename = tmp_path / "sub-01_eeg.fif"
+    raw.save(eeg_filename)
+
+    # Event times written with an explicit -05:00 offset, 5.25 s and 42 s after
+    # the start of the recording
+    offset = datetime.timezone(datetime.timedelta(hours=-5))
+    event_times = [
+        datetime.datetime(2024, 3, 1, 12, 0, 5, 250000, tzinfo=offset),
+        datetime.datetime(2024, 3, 1, 12, 0, 42, tzinfo=offset),
+    ]
+    events_filename = tmp_path / "sub-01_events.csv"
+    pd.DataFrame(
+        {
+            "timestamps": [event_time.timestamp() for event_time in event_times],
+            "StimMarkers_alpha": ["Start", "Crash 3"],
+        }
+    ).to_csv(events_filename, index=False)
+    return script.CSTpreprocessing(eeg_filename, events_filename)
+
 
-def test_example():
-    assert True
+def test_set_annotations_to_raw(
+    local_timezone: None, preprocessing: script.CSTpreprocessing
+) -> None:
+    """Test that the event timestamps are read as UTC, not as local time."""
+    preprocessing.set_annotations_to_raw()
+    annotations = preprocessing.raw.annotations
+    np.testing.assert_allclose(annotations.onset, [5.25, 42.0])
+    assert list(annotations.description) == ["Start", "Crash"]
+    assert preprocessing.process_history == ["ANNOTATIONS"]
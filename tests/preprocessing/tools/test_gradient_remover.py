@@ -1,10 +1,128 @@
-# ruff: noqa
-# remove the first line after populating the file
+#!/usr/bin/env -S  python  #
+# -*- coding: utf-8 -*-
+# ===============================================================================
+# Author: Dr. Samuel Louviot, PhD
+#         Dr. Alp Erkent, MD, MA
+# Institution: Nathan Kline Institute
+#              Child Mind Institute
+# Address: 140 Old Orangeburg Rd, Orangeburg, NY 10962, USA
+#          215 E 50th St, New York, NY 10022
+# Date: 2024-02-27
+# email: samuel DOT louviot AT nki DOT rfmh DOT org
+#        alp DOT erkent AT childmind DOT org
+# ===============================================================================
+# LICENCE GNU GPLv3:
+# Copyright (C) 2024  Dr. Samuel Louviot, PhD
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+# ===============================================================================
 
+"""Tests for the gradient_remover module."""
+
+import numpy as np
 import pytest
 
 import eeg_research.preprocessing.tools.gradient_remover as script
 
+TR_SPACING = 50
+N_TR = 12
+OFFSET = 13
+
+
+@pytest.fixture
+def eeg_data() -> np.ndarray:
+    """Create random (channels, time_points) data with samples around the TRs."""
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(4, OFFSET + N_TR * TR_SPACING + 20))
+
+
+@pytest.fixture
+def tr_events() -> np.ndarray:
+    """Create perfectly spaced TR onsets."""
+    return OFFSET + TR_SPACING * np.arange(N_TR)
+
+
+def stack_trs(data: np.ndarray) -> np.ndarray:
+    """Reshape the TRs of some data to (tr, channels, tr_timepoints)."""
+    trs = data[:, OFFSET : OFFSET + N_TR * TR_SPACING]
+    return np.moveaxis(trs.reshape(len(data), N_TR, TR_SPACING), 1, 0)
+
+
+@pytest.mark.parametrize("window", [(4, 4), (2, 3), (3, 0), (0, 2), 2])
+def test_correct_matches_get_tr_corrected(
+    eeg_data: np.ndarray, tr_events: np.ndarray, window: int | tuple[int, int]
+) -> None:
+    """Test that correct() matches the per-TR correction of every TR."""
+    remover = script.GradientRemover(eeg_data, tr_events, window)
+    corrected = remover.correct()
+    expected = np.stack([remover.get_tr_corrected(n) for n in range(N_TR)])
+    np.testing.assert_allclose(stack_trs(corrected), expected)
+    np.testing.assert_array_equal(corrected[:, :OFFSET], eeg_data[:, :OFFSET])
+    np.testing.assert_array_equal(
+        corrected[:, OFFSET + N_TR * TR_SPACING :],
+        eeg_data[:, OFFSET + N_TR * TR_SPACING :],
+    )
+
+
+@pytest.mark.parametrize("window", [(4, 4), (2, 3), (3, 0), (0, 2)])
+def test_correct_by_blocks(
+    eeg_data: np.ndarray,
+    tr_events: np.ndarray,
+    window: tuple[int, int],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that correcting one TR at a time gives the same result."""
+    expected = script.GradientRemover(eeg_data, tr_events, window).correct()
+    monkeypatch.setattr(script, "BLOCK_BYTES", 1)
+    corrected = script.GradientRemover(eeg_data, tr_events, window).correct()
+    np.testing.assert_allclose(corrected, expected)
+
+
+@pytest.mark.parametrize("window", [(2, 2), (0, 3)])
+def test_correct_edge_trs(
+    eeg_data: np.ndarray, tr_events: np.ndarray, window: tuple[int, int]
+) -> None:
+    """Test that TRs without a full template window are only detrended."""
+    remover = script.GradientRemover(eeg_data, tr_events, window)
+    corrected = stack_trs(remover.correct())
+    assert not np.isnan(corrected).any()
+    for n in range(N_TR):
+        if window[0] <= n <= N_TR - 1 - window[1]:
+            assert np.any(remover.get_tr_template(n))
+        else:
+            np.testing.assert_array_equal(remover.get_tr_template(n), 0)
+            np.testing.assert_allclose(corrected[n], remover.get_tr_detrended(n))
+
+
+def test_correct_keeps_float32(eeg_data: np.ndarray, tr_events: np.ndarray) -> None:
+    """Test that float32 data is corrected in float32."""
+    remover = script.GradientRemover(eeg_data.astype(np.float32), tr_events)
+    corrected = remover.correct()
+    assert corrected.dtype == np.float32
+    expected = script.GradientRemover(eeg_data, tr_events).correct()
+    np.testing.assert_allclose(corrected, expected, rtol=1e-4, atol=1e-4)
+
+
+def test_correct_integer_data(eeg_data: np.ndarray, tr_events: np.ndarray) -> None:
+    """Test that integer data is corrected in float64."""
+    integer_data = np.round(eeg_data * 1000).astype(np.int16)
+    corrected = script.GradientRemover(integer_data, tr_events).correct()
+    assert corrected.dtype == np.float64
+    expected = script.GradientRemover(integer_data.astype(np.float64), tr_events)
+    np.testing.assert_allclose(corrected, expected.correct())
+
 
-def test_example():
-    assert True
+def test_corrected_is_cached(eeg_data: np.ndarray, tr_events: np.ndarray) -> None:
+    """Test that the corrected property computes the correction once."""
+    remover = script.GradientRemover(eeg_data, tr_events)
+    corrected = remover.corrected
+    assert remover.corrected is corrected
+    np.testing.assert_array_equal(corrected, remover.correct())
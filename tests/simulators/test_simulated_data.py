@@ -4,6 +4,7 @@ import os
 from pathlib import Path
 
 import mne
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -58,6 +59,12 @@ def test_dummy_dataset_called_with_zeros() -> None:
         script.DummyDataset(n_subjects=0, n_sessions=0, n_runs=0)
 
 
+def test_dummy_dataset_called_with_zero_jobs() -> None:
+    """Test that a ValueError is raised when jobs is 0."""
+    with pytest.raises(ValueError, match="number of jobs"):
+        script.DummyDataset(jobs=0)
+
+
 def test_participant_metadata() -> None:
     """Test that the function returns a DataFrame with the participant metadata."""
     dataset = script.DummyDataset(n_subjects=5)
@@ -69,6 +76,40 @@ def test_participant_metadata() -> None:
         assert not any(nan_mask[column].values)
 
 
+def test_participant_metadata_is_seeded() -> None:
+    """Test that np.random.seed makes the participant metadata reproducible."""
+    metadata = list()
+    for _ in range(2):
+        np.random.seed(42)
+        dataset = script.DummyDataset(n_subjects=10)
+        dataset._create_participant_metadata()
+        metadata.append(dataset.participant_metadata)
+    pd.testing.assert_frame_equal(metadata[0], metadata[1])
+
+
+def test_participant_metadata_before_creation() -> None:
+    """Test that the participant metadata starts as an empty DataFrame."""
+    dataset = script.DummyDataset(n_subjects=5)
+    assert isinstance(dataset.participant_metadata, pd.DataFrame)
+    assert dataset.participant_metadata.empty
+    assert list(dataset.participant_metadata.columns) == [
+        "participant_id",
+        "sex",
+        "age",
+        "handedness",
+    ]
+
+
+def test_add_participant_metadata_before_creation() -> None:
+    """Test that adding a participant first creates the participant metadata."""
+    dataset = script.DummyDataset(n_subjects=5)
+    dataset._add_participant_metadata(
+        participant_id="sub-06", age=26, sex="M", handedness="R"
+    )
+    assert dataset.participant_metadata.shape[0] == 6
+    assert dataset.participant_metadata["participant_id"].iloc[-1] == "sub-06"
+
+
 def test_add_participant_metadata() -> None:
     """Test that the function adds a new participant to the participant metadata."""
     dataset = script.DummyDataset(n_subjects=5)
@@ -83,6 +124,18 @@ def test_add_participant_metadata() -> None:
         assert not any(nan_mask[column].values)
 
 
+def test_save_participant_metadata(testing_path: Path) -> None:
+    """Test that participants.tsv is written as pandas would write it."""
+    dataset = script.DummyDataset(n_subjects=3, root=testing_path)
+    dataset._add_participant_metadata(
+        participant_id="sub-04", age=26, sex="M", handedness="R"
+    )
+    dataset.bids_path.mkdir(parents=True, exist_ok=True)
+    dataset._save_participant_metadata()
+    saved = dataset.bids_path.joinpath("participants.tsv").read_text()
+    assert saved == dataset.participant_metadata.to_csv(sep="\t", index=False)
+
+
 def test_generate_label(testing_path: Path) -> None:
     """Test that the function generates the correct label."""
     dataset = script.DummyDataset(root=testing_path)
@@ -156,6 +209,25 @@ def test_method_create_eeg_dataset(testing_path: Path) -> None:
         assert eeg_path.exists()
 
 
+def test_method_create_eeg_dataset_fif(testing_path: Path) -> None:
+    """Test that the method creates an EEG dataset in the fif format."""
+    dataset = script.DummyDataset(root=testing_path)
+    dataset.create_eeg_dataset(fmt="fif", light=True)
+    eeg_path = dataset.bids_path.joinpath(
+        "sub-001", "ses-001", "eeg", "sub-001_ses-001_task-test_run-001_eeg.fif"
+    )
+    raw = mne.io.read_raw_fif(eeg_path)
+    assert eeg_path.with_suffix(".json").exists()
+    assert raw.info["sfreq"] > 0
+
+
+def test_method_create_eeg_dataset_unknown_format(testing_path: Path) -> None:
+    """Test that the method raises a ValueError for an unsupported format."""
+    dataset = script.DummyDataset(root=testing_path)
+    with pytest.raises(ValueError, match="not supported"):
+        dataset.create_eeg_dataset(fmt="gdf")
+
+
 def test_method_create_eeg_dataset_annotations(testing_path: Path) -> None:
     """Test that the method creates an EEG dataset with annotations."""
     dataset = script.DummyDataset(root=testing_path)